@@ -1,41 +1,372 @@
 import os
+import sys
+import csv
+import json
+import heapq
+import sqlite3
+from array import array
 
 books_file = "books.txt"
 sales_file = "sales.txt"
+db_file = "bookstore.db"
 
-def load_data():
+# First line of a file whose records are sealed with a RecordChain.
+SEALED_HEADER = "#bookstore-sealed-records v1"
+
+REPORT_PAGE_SIZE = 20
+
+class SalesLedger:
+    """Column-wise sales history with running totals.
+
+    Each sale is stored as a title id, a quantity and an amount in three
+    typed arrays, and the revenue totals are updated as sales are recorded,
+    so reports never have to walk the full history.
+    """
+
+    def __init__(self):
+        self.titles = []        # title id -> title
+        self.title_ids = {}     # title -> title id
+        self.sale_title = array("I")
+        self.sale_qty = array("i")
+        self.sale_amount = array("d")
+        self.total_revenue = 0.0
+        self.title_qty = []     # title id -> copies sold
+        self.title_revenue = [] # title id -> revenue
+        self.saved = 0          # sales already written to sales_file
+
+    def __len__(self):
+        return len(self.sale_qty)
+
+    def _title_id(self, title):
+        tid = self.title_ids.get(title)
+        if tid is None:
+            tid = len(self.titles)
+            self.title_ids[title] = tid
+            self.titles.append(title)
+            self.title_qty.append(0)
+            self.title_revenue.append(0.0)
+        return tid
+
+    def record(self, title, qty, amount):
+        tid = self._title_id(title)
+        self.sale_title.append(tid)
+        self.sale_qty.append(qty)
+        self.sale_amount.append(amount)
+        self.total_revenue += amount
+        self.title_qty[tid] += qty
+        self.title_revenue[tid] += amount
+
+    def title_totals(self):
+        """Yield (title, quantity, revenue) for every title sold."""
+        for tid, title in enumerate(self.titles):
+            yield title, self.title_qty[tid], self.title_revenue[tid]
+
+    def top_sellers(self, n=5):
+        """Return the n best-selling titles by copies sold."""
+        return heapq.nlargest(n, self.title_totals(), key=lambda t: t[1])
+
+    def rows(self, start=0, stop=None):
+        """Yield (title, quantity, amount) for the sales in [start, stop)."""
+        if stop is None or stop > len(self):
+            stop = len(self)
+        titles = self.titles
+        for i in range(start, stop):
+            yield titles[self.sale_title[i]], self.sale_qty[i], self.sale_amount[i]
+
+    def page(self, page_no, page_size=REPORT_PAGE_SIZE):
+        """Return one page (0-based) of the detailed sales listing."""
+        start = page_no * page_size
+        return list(self.rows(start, start + page_size))
+
+    def export_csv(self, path):
+        """Stream the full sales history to a CSV file."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["title", "quantity", "amount"])
+            writer.writerows(self.rows())
+        return len(self)
+
+DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    title TEXT PRIMARY KEY COLLATE NOCASE,
+    price REAL NOT NULL,
+    stock INTEGER NOT NULL CHECK (stock >= 0)
+);
+CREATE TABLE IF NOT EXISTS sales (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    qty INTEGER NOT NULL,
+    amount REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sales_totals (
+    title TEXT PRIMARY KEY,
+    qty INTEGER NOT NULL,
+    revenue REAL NOT NULL
+);
+"""
+
+class BookstoreDB:
+    """SQLite (WAL mode) store that several tills can sell from at once.
+
+    Stock is only ever decremented by a conditional UPDATE inside a write
+    transaction, so a sale is either applied in full or rejected, and two
+    tills can never oversell the same copies. Sales totals are kept in the
+    sales_totals table, so the report methods mirror SalesLedger.
+    """
+
+    def __init__(self, path=db_file, timeout=30.0):
+        self.path = path
+        # Autocommit mode: transactions are opened explicitly with BEGIN.
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(DB_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add_book(self, title, price, quantity):
+        """Add a new title, or restock an existing one at the new price."""
+        self.conn.execute(
+            "INSERT INTO books (title, price, stock) VALUES (?, ?, ?) "
+            "ON CONFLICT(title) DO UPDATE SET price = excluded.price, "
+            "stock = stock + excluded.stock",
+            (title, price, quantity))
+
+    def books(self):
+        return [list(row) for row in self.conn.execute(
+            "SELECT title, price, stock FROM books ORDER BY rowid")]
+
+    def sell(self, title, qty):
+        """Sell qty copies of title. Returns the amount, or None if rejected."""
+        return self.sell_many([(title, qty)])[0]
+
+    def sell_many(self, orders):
+        """Apply a batch of (title, qty) orders in a single transaction.
+
+        Returns one entry per order: the sale amount, or None when the title
+        is unknown or there is not enough stock.
+        """
+        results = []
+        cur = self.conn.cursor()
+        # IMMEDIATE takes the write lock up front, so the stock check and the
+        # decrement below cannot interleave with another till's batch.
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            for title, qty in orders:
+                if qty <= 0:
+                    results.append(None)
+                    continue
+                cur.execute(
+                    "UPDATE books SET stock = stock - ? "
+                    "WHERE title = ? AND stock >= ?",
+                    (qty, title, qty))
+                if cur.rowcount != 1:
+                    results.append(None)
+                    continue
+                name, price = cur.execute(
+                    "SELECT title, price FROM books WHERE title = ?",
+                    (title,)).fetchone()
+                amount = qty * price
+                cur.execute(
+                    "INSERT INTO sales (title, qty, amount) VALUES (?, ?, ?)",
+                    (name, qty, amount))
+                cur.execute(
+                    "INSERT INTO sales_totals (title, qty, revenue) VALUES (?, ?, ?) "
+                    "ON CONFLICT(title) DO UPDATE SET qty = qty + excluded.qty, "
+                    "revenue = revenue + excluded.revenue",
+                    (name, qty, amount))
+                results.append(amount)
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        return results
+
+    def is_empty(self):
+        return (self.conn.execute("SELECT 1 FROM books LIMIT 1").fetchone() is None
+                and self.conn.execute("SELECT 1 FROM sales LIMIT 1").fetchone() is None)
+
+    def import_data(self, books, sales):
+        """Copy in-memory books and a SalesLedger into an empty database.
+
+        Returns False without importing when the database already has data,
+        e.g. because another till imported first.
+        """
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            # Checked under the write lock so only one till can import.
+            if not self.is_empty():
+                cur.execute("ROLLBACK")
+                return False
+            for b in books:
+                cur.execute(
+                    "INSERT INTO books (title, price, stock) VALUES (?, ?, ?) "
+                    "ON CONFLICT(title) DO UPDATE SET stock = stock + excluded.stock",
+                    (b[0], b[1], b[2]))
+            cur.executemany(
+                "INSERT INTO sales (title, qty, amount) VALUES (?, ?, ?)",
+                sales.rows())
+            cur.executemany(
+                "INSERT INTO sales_totals (title, qty, revenue) VALUES (?, ?, ?) "
+                "ON CONFLICT(title) DO UPDATE SET qty = qty + excluded.qty, "
+                "revenue = revenue + excluded.revenue",
+                sales.title_totals())
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        return True
+
+    # Report interface shared with SalesLedger.
+
+    def __len__(self):
+        # Sales are append-only, so the largest id is the count (an index
+        # lookup, unlike COUNT(*) which scans the table).
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM sales").fetchone()[0]
+
+    @property
+    def total_revenue(self):
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(revenue), 0.0) FROM sales_totals").fetchone()[0]
+
+    def title_totals(self):
+        return self.conn.execute(
+            "SELECT title, qty, revenue FROM sales_totals ORDER BY rowid")
+
+    def top_sellers(self, n=5):
+        return self.conn.execute(
+            "SELECT title, qty, revenue FROM sales_totals "
+            "ORDER BY qty DESC LIMIT ?", (n,)).fetchall()
+
+    def rows(self, start=0, stop=None):
+        # ids run 1..len(self) with no gaps, so a page is an id range.
+        if stop is None:
+            return self.conn.execute(
+                "SELECT title, qty, amount FROM sales WHERE id > ? ORDER BY id", (start,))
+        return self.conn.execute(
+            "SELECT title, qty, amount FROM sales WHERE id > ? AND id <= ? ORDER BY id",
+            (start, stop))
+
+    def page(self, page_no, page_size=REPORT_PAGE_SIZE):
+        start = page_no * page_size
+        return self.rows(start, start + page_size).fetchall()
+
+    def export_csv(self, path):
+        count = 0
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["title", "quantity", "amount"])
+            for row in self.rows():
+                writer.writerow(row)
+                count += 1
+        return count
+
+_db_connections = {}
+
+def open_db(path=db_file):
+    """Return this process's BookstoreDB for path, opening it on first use."""
+    key = (os.getpid(), os.path.abspath(path))
+    db = _db_connections.get(key)
+    if db is None:
+        db = _db_connections[key] = BookstoreDB(path)
+    return db
+
+def load_chain(session_path):
+    """Build the record chain used to encrypt books.txt and sales.txt.
+
+    session_path is a session.json written by HybridCryptProject.py; its
+    algorithm steps and keys are reused for every record.
+    """
+    from HybridCryptProject import RecordChain
+    with open(session_path, "r") as f:
+        return RecordChain(json.load(f)["steps"])
+
+def is_sealed(path):
+    with open(path, "r") as f:
+        return f.readline().rstrip("\n") == SEALED_HEADER
+
+def read_records(path, chain=None):
+    """Return (stored lines, records): the lines as on disk and their plaintext."""
+    with open(path, "r") as f:
+        lines = [line.strip() for line in f]
+    sealed = bool(lines) and lines[0] == SEALED_HEADER
+    # An empty file is valid in either mode.
+    if sealed and chain is None:
+        raise ValueError(f"{path} is encrypted; run with --session <session.json>")
+    if chain is not None and lines and not sealed:
+        raise ValueError(f"{path} is not encrypted; seal it once with --session <session.json> --seal")
+    lines = [line for line in lines[sealed:] if line]
+    return lines, chain.open_many(lines) if chain is not None else lines
+
+def seal_files(chain):
+    """One-time migration: seal existing plaintext books.txt/sales.txt in place."""
+    sealed = []
+    for path in (books_file, sales_file):
+        if not os.path.exists(path) or is_sealed(path):
+            continue
+        _, records = read_records(path)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(SEALED_HEADER + "\n")
+            for record in records:
+                f.write(chain.seal(record) + "\n")
+        os.replace(tmp, path)
+        sealed.append(path)
+    return sealed
+
+def load_data(chain=None):
     books = []
-    sales = []
+    sales = SalesLedger()
 
     if os.path.exists(books_file):
-        with open(books_file, "r") as f:
-            for line in f:
-                data = line.strip().split(",")
-                if len(data) == 3:
-                    books.append([data[0], float(data[1]), int(data[2])])
+        for stored, line in zip(*read_records(books_file, chain)):
+            data = line.split(",")
+            if len(data) == 3:
+                book = [data[0], float(data[1]), int(data[2])]
+                if chain is not None:
+                    # Sealed line kept until the row changes, so unchanged
+                    # books are written back without re-encrypting them.
+                    book.append(stored)
+                books.append(book)
 
     if os.path.exists(sales_file):
-        with open(sales_file, "r") as f:
-            for line in f:
-                data = line.strip().split(",")
-                if len(data) == 3:
-                    sales.append([data[0], int(data[1]), float(data[2])])
+        for line in read_records(sales_file, chain)[1]:
+            data = line.split(",")
+            if len(data) == 3:
+                sales.record(data[0], int(data[1]), float(data[2]))
+        sales.saved = len(sales)
 
     return books, sales
 
-def save_data(books, sales):
+def save_data(books, sales, chain=None):
+    # Each line is one record; with a chain every record is sealed on its own,
+    # so appending a sale never re-encrypts the rest of the file, and only the
+    # books added or changed this session are sealed again.
+    seal = chain.seal if chain is not None else str
     with open(books_file, "w") as f:
+        if chain is not None:
+            f.write(SEALED_HEADER + "\n")
         for b in books:
-            f.write(f"{b[0]},{b[1]},{b[2]}\n")
+            line = b[3] if len(b) > 3 else seal(f"{b[0]},{b[1]},{b[2]}")
+            f.write(line + "\n")
 
-    with open(sales_file, "w") as f:
-        for s in sales:
-            f.write(f"{s[0]},{s[1]},{s[2]}\n")
+    # Sales history is append-only: only write the sales made this session.
+    with open(sales_file, "a") as f:
+        if chain is not None and f.tell() == 0:
+            f.write(SEALED_HEADER + "\n")
+        for s in sales.rows(sales.saved):
+            f.write(seal(f"{s[0]},{s[1]},{s[2]}") + "\n")
+    sales.saved = len(sales)
 
 def add_book(books):
     title = input("Enter book title: ")
     price = float(input("Enter price: "))
     quantity = int(input("Enter quantity: "))
+    if price < 0 or quantity < 0:
+        print("\n❌ Price and quantity cannot be negative.\n")
+        return
     books.append([title, price, quantity])
     print(f"\n✅ Book '{title}' added successfully!\n")
 
@@ -44,16 +375,42 @@ def sell_book(books, sales):
     for book in books:
         if book[0].lower() == title.lower():
             qty = int(input("Enter quantity to sell: "))
-            if qty <= book[2]:
+            if qty <= 0:
+                # Same rule as BookstoreDB.sell_many, so both backends agree.
+                print("\n❌ Enter a quantity of at least 1.\n")
+            elif qty <= book[2]:
                 book[2] -= qty
+                del book[3:]    # row changed: seal it again on save
                 amount = qty * book[1]
-                sales.append([book[0], qty, amount])
+                sales.record(book[0], qty, amount)
                 print(f"\n✅ Sold {qty} copies of '{book[0]}'.\n")
             else:
                 print("\n❌ Not enough stock available.\n")
             return
     print("\n❌ Book not found in stock.\n")
 
+def db_add_book(db):
+    title = input("Enter book title: ")
+    price = float(input("Enter price: "))
+    quantity = int(input("Enter quantity: "))
+    if price < 0 or quantity < 0:
+        print("\n❌ Price and quantity cannot be negative.\n")
+        return
+    db.add_book(title, price, quantity)
+    print(f"\n✅ Book '{title}' added successfully!\n")
+
+def db_sell_book(db):
+    title = input("Enter book title to sell: ")
+    qty = int(input("Enter quantity to sell: "))
+    if qty <= 0:
+        print("\n❌ Enter a quantity of at least 1.\n")
+        return
+    amount = db.sell(title, qty)
+    if amount is None:
+        print("\n❌ Book not found or not enough stock available.\n")
+    else:
+        print(f"\n✅ Sold {qty} copies of '{title}'.\n")
+
 def view_report(books, sales):
     print("\n--- STOCK REPORT ---")
     if not books:
@@ -63,37 +420,133 @@ def view_report(books, sales):
             print(f"{b[0]} | Price: ₹{b[1]} | Stock: {b[2]}")
 
     print("\n--- SALES REPORT ---")
-    if not sales:
+    if not len(sales):
         print("No sales yet.")
     else:
-        total = 0
-        for s in sales:
+        for title, qty, revenue in sales.title_totals():
+            print(f"{title} | Qty: {qty} | Amount: ₹{revenue}")
+        print(f"Sales: {len(sales)}")
+        print(f"Total Revenue: ₹{sales.total_revenue}\n")
+
+def view_top_sellers(sales):
+    try:
+        n = int(input("How many titles? "))
+    except ValueError:
+        print("\n❌ Enter a whole number.\n")
+        return
+    if n < 1:
+        print("\n❌ Enter at least 1.\n")
+        return
+    print("\n--- TOP SELLERS ---")
+    if not len(sales):
+        print("No sales yet.")
+    for rank, (title, qty, revenue) in enumerate(sales.top_sellers(n), 1):
+        print(f"{rank}. {title} | Qty: {qty} | Amount: ₹{revenue}")
+    print()
+
+def view_sales_detail(sales):
+    pages = max(1, -(-len(sales) // REPORT_PAGE_SIZE))
+    page_no = 0
+    while True:
+        print(f"\n--- SALES DETAIL (page {page_no + 1}/{pages}) ---")
+        rows = sales.page(page_no)
+        if not rows:
+            print("No sales yet.")
+        for s in rows:
             print(f"{s[0]} | Qty: {s[1]} | Amount: ₹{s[2]}")
-            total += s[2]
-        print(f"Total Revenue: ₹{total}\n")
+        action = input("(n)ext / (p)revious / (q)uit: ").strip().lower()
+        if action == "n" and page_no + 1 < pages:
+            page_no += 1
+        elif action == "p" and page_no > 0:
+            page_no -= 1
+        elif action == "q":
+            print()
+            return
 
-def main():
-    books, sales = load_data()
+def export_sales(sales):
+    path = input("Enter CSV file name: ")
+    try:
+        count = sales.export_csv(path)
+    except OSError as e:
+        print(f"\n❌ Could not write '{path}': {e.strerror or e}\n")
+        return
+    print(f"\n✅ Exported {count} sales to '{path}'.\n")
+
+def main(db_path=None, session_path=None):
+    # With a database every till shares one store and each sale is committed
+    # immediately; otherwise the text files are loaded and saved on exit.
+    # (Test db against None: BookstoreDB has __len__, so an empty one is falsy.)
+    db = None
+    chain = load_chain(session_path) if session_path else None
+    if db_path:
+        db = sales = open_db(db_path)
+        if db.is_empty():
+            books, ledger = load_data(chain)
+            db.import_data(books, ledger)
+    else:
+        books, sales = load_data(chain)
 
     while True:
         print("📚 BOOKSTORE MENU")
         print("1. Add Book")
         print("2. Sell Book")
         print("3. View Report")
-        print("4. Exit")
+        print("4. Top Sellers")
+        print("5. Sales Detail")
+        print("6. Export Sales (CSV)")
+        print("7. Exit")
         choice = input("Enter your choice: ")
 
         if choice == "1":
-            add_book(books)
+            if db is not None:
+                db_add_book(db)
+            else:
+                add_book(books)
         elif choice == "2":
-            sell_book(books, sales)
+            if db is not None:
+                db_sell_book(db)
+            else:
+                sell_book(books, sales)
         elif choice == "3":
-            view_report(books, sales)
+            view_report(db.books() if db is not None else books, sales)
         elif choice == "4":
-            save_data(books, sales)
+            view_top_sellers(sales)
+        elif choice == "5":
+            view_sales_detail(sales)
+        elif choice == "6":
+            export_sales(sales)
+        elif choice == "7":
+            if db is None:
+                save_data(books, sales, chain)
             print("Exiting... Data saved. Goodbye!")
             break
         else:
             print("❌ Invalid choice, try again.\n")
 
-main()
+if __name__ == "__main__":
+    # python Bookstore.py [--db [bookstore.db]] [--session session.json [--seal]]
+    #   --session  books.txt/sales.txt are encrypted record by record with the
+    #              session's cipher chain. With --db it is only used to read the
+    #              text files for the first-use import; the database itself is
+    #              not encrypted.
+    #   --seal     encrypt existing plaintext books.txt/sales.txt once, then exit.
+    args = sys.argv[1:]
+    db_path = session_path = None
+    if "--db" in args:
+        i = args.index("--db") + 1
+        db_path = args[i] if i < len(args) and not args[i].startswith("--") else db_file
+    if "--session" in args:
+        i = args.index("--session") + 1
+        if i >= len(args) or args[i].startswith("--"):
+            sys.exit("❌ --session needs a session file, e.g. --session session.json")
+        session_path = args[i]
+    try:
+        if "--seal" in args:
+            if not session_path:
+                sys.exit("❌ --seal needs --session <session.json>")
+            sealed = seal_files(load_chain(session_path))
+            print(f"✅ Sealed: {', '.join(sealed)}" if sealed else "Nothing to seal.")
+        else:
+            main(db_path, session_path)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
@@ -0,0 +1,108 @@
+"""
+Load test for the shared SQLite Bookstore backend.
+
+Starts many seller processes that sell random titles from the same
+database at once, then checks that no stock was lost or oversold:
+for every title, initial stock - final stock must equal the copies
+recorded in the sales table, the running totals, and the sellers' own
+tallies, and no stock may go negative.
+
+Run: python BookstoreLoadTest.py [sellers] [orders_per_seller] [batch_size]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import multiprocessing as mp
+from collections import Counter
+
+from Bookstore import BookstoreDB, open_db
+
+TITLES = 20
+INITIAL_STOCK = 500
+PRICE = 9.5
+
+
+def seed(path):
+    db = BookstoreDB(path)
+    for i in range(TITLES):
+        db.add_book(f"Book {i}", PRICE, INITIAL_STOCK)
+    db.close()
+
+
+def seller(args):
+    path, seller_id, orders, batch_size = args
+    rng = random.Random(seller_id)
+    db = open_db(path)
+    sold = Counter()
+    accepted = rejected = 0
+    for start in range(0, orders, batch_size):
+        batch = [(f"Book {rng.randrange(TITLES)}", rng.randint(1, 5))
+                 for _ in range(min(batch_size, orders - start))]
+        for (title, qty), amount in zip(batch, db.sell_many(batch)):
+            if amount is None:
+                rejected += 1
+            else:
+                accepted += 1
+                sold[title] += qty
+    return accepted, rejected, sold
+
+
+def check(path, sold):
+    db = BookstoreDB(path)
+    errors = []
+    stock = {title: n for title, _, n in db.books()}
+    in_sales = dict(db.conn.execute("SELECT title, SUM(qty) FROM sales GROUP BY title"))
+    in_totals = {title: qty for title, qty, _ in db.title_totals()}
+    for i in range(TITLES):
+        title = f"Book {i}"
+        removed = INITIAL_STOCK - stock[title]
+        if stock[title] < 0:
+            errors.append(f"{title}: negative stock {stock[title]}")
+        for name, n in (("sales", in_sales.get(title, 0)),
+                        ("totals", in_totals.get(title, 0)),
+                        ("sellers", sold[title])):
+            if n != removed:
+                errors.append(f"{title}: stock dropped by {removed}, {name} say {n}")
+    db.close()
+    return errors
+
+
+def main():
+    sellers = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    orders = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "loadtest.db")
+        seed(path)
+
+        jobs = [(path, i, orders, batch_size) for i in range(sellers)]
+        with mp.Pool(sellers) as pool:
+            start = time.perf_counter()
+            results = pool.map(seller, jobs)
+            elapsed = time.perf_counter() - start
+
+        accepted = sum(r[0] for r in results)
+        rejected = sum(r[1] for r in results)
+        sold = Counter()
+        for r in results:
+            sold.update(r[2])
+        errors = check(path, sold)
+
+    total = accepted + rejected
+    print(f"Sellers: {sellers} | Orders: {total} | Batch size: {batch_size}")
+    print(f"Accepted: {accepted} | Rejected (out of stock): {rejected}")
+    print(f"Elapsed: {elapsed:.2f}s | {total / elapsed:.0f} orders/s | "
+          f"{sellers * -(-orders // batch_size) / elapsed:.0f} transactions/s")
+    if errors:
+        print(f"❌ {len(errors)} stock inconsistencies:")
+        for e in errors:
+            print("  " + e)
+        sys.exit(1)
+    print("✅ Zero stock inconsistencies.")
+
+
+if __name__ == "__main__":
+    main()
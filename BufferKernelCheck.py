@@ -0,0 +1,181 @@
+"""
+Self-check for the byte buffer kernels.
+
+Every *_buffer function is compared with its str counterpart over many message
+lengths, both in place and into a separate buffer, with the chunk sizes
+(BUFFER_CHUNK / CHUNK) set to a few bytes so that every chunk boundary case is
+hit, and once more at the default chunk size:
+- HybridCryptProject: Caesar, Affine, Hill2x2 (odd letter counts, odd
+  ciphertexts rejected untouched), RailFence (rails <= 1 and rails > length),
+  and run_chain_buffers against apply_encrypt/apply_decrypt, with DES/AES
+  steps checked by round trip.
+- Ceaser.caesar_encrypt_buffer, Hill.hill_encrypt_buffer and
+  Dtranspotion.transpose_buffer.
+
+Run: python BufferKernelCheck.py [max_length]
+"""
+import sys
+import random
+from contextlib import contextmanager
+
+import HybridCryptProject as hc
+import Ceaser
+import Hill
+import Dtranspotion
+from HybridCryptProject import (Caesar, Affine, Hill2x2, RailFence, apply_encrypt, apply_decrypt,
+                                run_chain_buffers, to_b64)
+
+CHUNK_SIZES = (1, 2, 3, 5, 8, None)   # None: the modules' own defaults
+ALPHABET = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ .,!-\n'
+HILL_ALPHABET = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ '
+FILL = 35   # '#': dst bytes past the result must be left alone
+MATRIX = [[3, 3], [2, 5]]
+
+
+@contextmanager
+def chunk_size(size):
+    modules = [(hc, 'BUFFER_CHUNK'), (Ceaser, 'CHUNK'), (Hill, 'CHUNK'), (Dtranspotion, 'CHUNK')]
+    saved = [getattr(m, name) for m, name in modules]
+    try:
+        if size is not None:
+            for m, name in modules:
+                setattr(m, name, size)
+        yield
+    finally:
+        for (m, name), value in zip(modules, saved):
+            setattr(m, name, value)
+
+
+def check_kernel(label, kernel, expected, text, grows=False):
+    """kernel(src, dst) -> length; dst None means in place."""
+    data = text.encode('ascii')
+    want = expected(text).encode('ascii')
+
+    dst = bytearray([FILL]) * (len(want) + 4)
+    n = kernel(data, dst)
+    assert dst[:n] == want and set(dst[n:]) <= {FILL}, (label, 'dst', text)
+
+    buf = bytearray(data)
+    n = kernel(buf, None)
+    assert buf[:n] == want, (label, 'bytearray in place', text)
+
+    if not grows:
+        # A memoryview cannot be resized, so only length-preserving kernels.
+        buf = bytearray(data)
+        with memoryview(buf) as mv:
+            n = kernel(mv, None)
+        assert buf[:n] == want, (label, 'memoryview in place', text)
+
+
+def check_hybrid(rng, lengths, max_length):
+    for length in lengths:
+        text = ''.join(rng.choice(ALPHABET) for _ in range(length))
+        for shift in (0, 3, 25, -7):
+            check_kernel('Caesar enc', lambda s, d: Caesar.encrypt_buffer(s, shift, d),
+                         lambda t: Caesar.encrypt(t, shift), text)
+            check_kernel('Caesar dec', lambda s, d: Caesar.decrypt_buffer(s, shift, d),
+                         lambda t: Caesar.decrypt(t, shift), text)
+        for a, b in ((5, 8), (1, 0), (25, 13)):
+            check_kernel('Affine enc', lambda s, d: Affine.encrypt_buffer(s, a, b, d),
+                         lambda t: Affine.encrypt(t, a, b), text)
+            check_kernel('Affine dec', lambda s, d: Affine.decrypt_buffer(s, a, b, d),
+                         lambda t: Affine.decrypt(t, a, b), text)
+        check_kernel('Hill2x2 enc', lambda s, d: Hill2x2.encrypt_buffer(s, MATRIX, d),
+                     lambda t: Hill2x2.encrypt(t, MATRIX), text, grows=True)
+        if len(Hill2x2._nums(text)) % 2:
+            buf = bytearray(text, 'ascii')
+            try:
+                Hill2x2.decrypt_buffer(buf, MATRIX)
+            except ValueError:
+                assert buf == text.encode('ascii'), ('Hill2x2 dec wrote before rejecting', text)
+            else:
+                raise AssertionError(('Hill2x2 dec accepted odd letters', text))
+        else:
+            check_kernel('Hill2x2 dec', lambda s, d: Hill2x2.decrypt_buffer(s, MATRIX, d),
+                         lambda t: Hill2x2.decrypt(t, MATRIX), text)
+        # rails > length: every character on its own rail (short messages only,
+        # each chunk walks every rail)
+        for rails in (0, 1, 2, 3, 4, 7) + ((length + 3,) if length <= max_length else ()):
+            check_kernel('RailFence enc', lambda s, d: RailFence.encrypt_buffer(s, rails, d),
+                         lambda t: RailFence.encrypt(t, rails), text)
+            check_kernel('RailFence dec', lambda s, d: RailFence.decrypt_buffer(s, rails, d),
+                         lambda t: RailFence.decrypt(t, rails), text)
+
+
+def check_standalone(rng, lengths):
+    for length in lengths:
+        text = ''.join(rng.choice(ALPHABET) for _ in range(length))
+        for key in (0, 3, 29, -4):
+            check_kernel('caesar_encrypt_buffer', lambda s, d: Ceaser.caesar_encrypt_buffer(s, key, d),
+                         lambda t: Ceaser.caesar_encrypt(t, key), text)
+            check_kernel('caesar_decrypt_buffer', lambda s, d: Ceaser.caesar_decrypt_buffer(s, key, d),
+                         lambda t: Ceaser.caesar_decrypt(t, key), text)
+        for key in ('1', '31', '3142', '52413'):
+            check_kernel('transpose_buffer', lambda s, d: Dtranspotion.transpose_buffer(s, key, d),
+                         lambda t: Dtranspotion.transpose(t, key), text, grows=True)
+        # hill_encrypt only drops spaces, so it is checked on letters and spaces.
+        text = ''.join(rng.choice(HILL_ALPHABET) for _ in range(length))
+        check_kernel('hill_encrypt_buffer', lambda s, d: Hill.hill_encrypt_buffer(s, MATRIX, d),
+                     lambda t: Hill.hill_encrypt(t, Hill.np.array(MATRIX)), text, grows=True)
+
+
+def _serial(steps, text, decrypt=False):
+    if decrypt:
+        for step in reversed(steps):
+            text = apply_decrypt(step['algo'], step['params'], text)
+    else:
+        for step in steps:
+            text = apply_encrypt(step['algo'], step['params'], text)
+    return text
+
+
+def random_steps(rng, modern):
+    choices = [
+        lambda: {'algo': 'Caesar', 'params': {'shift': rng.randrange(26)}},
+        lambda: {'algo': 'Affine', 'params': {'a': rng.choice((1, 5, 7, 25)), 'b': rng.randrange(26)}},
+        lambda: {'algo': 'Hill2x2', 'params': {'matrix': MATRIX}},
+        lambda: {'algo': 'RailFence', 'params': {'rails': rng.randrange(0, 6)}},
+    ]
+    if modern:
+        del choices[2]  # Hill2x2 drops the non-letters of base64, so it cannot be undone
+    steps = [rng.choice(choices)() for _ in range(rng.randint(1, 5))]
+    for algo in modern:
+        key = bytes(rng.randrange(256) for _ in range(8 if algo == 'DES' else 16))
+        params = {'key_b64': to_b64(key)}
+        if algo == 'DES':
+            params['backend'] = 'python'
+        steps.insert(rng.randint(0, len(steps)), {'algo': algo, 'params': params})
+    return steps
+
+
+def check_chains(rng, lengths):
+    modern = [()] * 6 + [('DES',)]
+    if hc.AES is not None:
+        modern += [('AES',), ('DES', 'AES')]
+    for length in lengths:
+        text = ''.join(rng.choice(ALPHABET) for _ in range(length))
+        steps = random_steps(rng, rng.choice(modern))
+        enc = run_chain_buffers(steps, text.encode('ascii')).decode('ascii')
+        if any(s['algo'] in ('DES', 'AES') for s in steps):
+            # Random IVs: compare what the ciphertexts decrypt to.
+            assert _serial(steps, enc, True) == _serial(steps, _serial(steps, text), True), (steps, text)
+        else:
+            assert enc == _serial(steps, text), (steps, text)
+        dec = run_chain_buffers(steps, enc.encode('ascii'), True).decode('ascii')
+        assert dec == _serial(steps, enc, True), (steps, text)
+
+
+def main():
+    max_length = int(sys.argv[1]) if len(sys.argv) > 1 else 48
+    lengths = list(range(max_length + 1)) + [97, 256, 1001]
+    rng = random.Random(0)
+    for size in CHUNK_SIZES:
+        with chunk_size(size):
+            check_hybrid(rng, lengths, max_length)
+            check_standalone(rng, lengths)
+            check_chains(rng, lengths)
+        print(f'Chunk size {size or "default"}: buffer kernels match the str versions: OK')
+
+
+if __name__ == '__main__':
+    main()
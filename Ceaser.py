@@ -14,6 +14,39 @@ def caesar_decrypt(text, key):
     return caesar_encrypt(text, -key)
 
 
+CHUNK = 1 << 16  # bytes translated per step by the buffer functions
+
+
+def caesar_table(key):
+    # 256-byte lookup table: shifts ASCII letters, leaves every other byte alone
+    table = bytearray(range(256))
+    for i in range(26):
+        table[65 + i] = (i + key) % 26 + 65
+        table[97 + i] = (i + key) % 26 + 97
+    return bytes(table)
+
+
+def caesar_encrypt_buffer(buf, key, out=None):
+    """Caesar on ASCII bytes in a bytearray/memoryview.
+
+    Transforms buf in place, or writes into out if given, CHUNK bytes at
+    a time. Returns the number of bytes written.
+    """
+    table = caesar_table(key)
+    if out is None:
+        out = buf
+    with memoryview(buf) as mv:
+        n = len(mv)
+        for i in range(0, n, CHUNK):
+            j = min(i + CHUNK, n)
+            out[i:j] = bytes(mv[i:j]).translate(table)
+    return n
+
+
+def caesar_decrypt_buffer(buf, key, out=None):
+    return caesar_encrypt_buffer(buf, -key, out)
+
+
 def main():
     while True:
         print("\n--- Caesar Cipher Menu ---")
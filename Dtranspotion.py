@@ -1,5 +1,7 @@
 import math
 
+CHUNK = 1 << 16  # rows copied per step by transpose_buffer
+
 # ---------- Helper Functions ----------
 
 def transpose(text, key):
@@ -22,6 +24,40 @@ def transpose(text, key):
     return ciphertext
 
 
+def transpose_buffer(buf, key, out=None):
+    """Same as transpose, on ASCII bytes in a bytearray/memoryview.
+
+    Writes into out, or back into buf when out is None (the last row is
+    padded with X, so out/buf must be a bytearray or have room for
+    ceil(len/n)*n bytes). Returns the number of bytes written.
+
+    With out, columns are copied CHUNK rows at a time. In place needs one
+    snapshot of buf, since any output byte can come from any input byte.
+    """
+    n = len(key)
+    length = len(buf)
+    rows = -(-length // n)
+    src = buf
+    if out is None:
+        src, out = bytes(buf), buf
+
+    ordered = sorted(list(enumerate(key)), key=lambda x: x[1])
+
+    pos = 0
+    with memoryview(src) as mv:
+        for idx, _ in ordered:
+            # Column idx of the row matrix is every n-th byte starting at idx
+            filled = max(0, -(-(length - idx) // n))
+            for r in range(0, filled, CHUNK):
+                r1 = min(r + CHUNK, filled)
+                out[pos:pos + r1 - r] = bytes(mv[idx + r*n: idx + r1*n: n])
+                pos += r1 - r
+            # Pad last row with X if short
+            out[pos:pos + rows - filled] = b'X' * (rows - filled)
+            pos += rows - filled
+    return pos
+
+
 def transpose_decrypt_with_rows(cipher, key, rows):
     n = len(key)
     mat = [[''] * n for _ in range(rows)]
@@ -15,6 +15,42 @@ def hill_encrypt(text, key_matrix):
 
     return result
 
+CHUNK = 1 << 16  # bytes read per step by hill_encrypt_buffer
+
+def _hill_pairs(data, key_matrix):
+    pairs = np.frombuffer(data, dtype=np.uint8).astype(np.int64).reshape(-1, 2) - 65
+    res = (pairs @ key_matrix.T) % 26 + 65
+    return res.astype(np.uint8).tobytes()
+
+def hill_encrypt_buffer(buf, key_matrix, out=None):
+    """Same as hill_encrypt, on ASCII bytes in a bytearray/memoryview.
+
+    Writes into out, or back into buf when out is None, CHUNK bytes at a
+    time. Spaces are removed and an 'X' may be added, so the result length
+    can differ from len(buf); it is returned. out (or buf) must be a
+    bytearray or have room for it.
+    """
+    key_matrix = np.asarray(key_matrix)
+    if out is None:
+        out = buf
+
+    # Output never gets ahead of input, so writing back into buf is safe.
+    written = 0
+    carry = b""
+    with memoryview(buf) as mv:
+        for i in range(0, len(mv), CHUNK):
+            data = carry + bytes(mv[i:i + CHUNK]).upper().replace(b" ", b"")
+            even = len(data) - len(data) % 2
+            carry = data[even:]
+            if even:
+                out[written:written + even] = _hill_pairs(data[:even], key_matrix)
+                written += even
+
+    if carry:
+        out[written:written + 2] = _hill_pairs(carry + b"X", key_matrix)  # padding
+        written += 2
+    return written
+
 def mod_inverse(a, m):
     """Return modular inverse of a mod m, if exists."""
     for x in range(1, m):
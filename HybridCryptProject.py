@@ -16,23 +16,47 @@ Features:
 Notes:
 - Classical ciphers operate on text strings. Modern ciphers (DES/AES) operate on bytes and their output (iv+ct) is base64-encoded to produce an ASCII string that can be fed into subsequent classical layers.
 - AES key must be 16/24/32 bytes (the program enforces 16/24/32). DES key must be 8 bytes.
+- The DES step can run on pycryptodome or on the in-project engine in PureDES.py (backend 'python'); both produce the same iv+ct format.
 - Hill 2x2 matrix is validated for invertibility mod 26 before use.
+- Every classical cipher also has encrypt_buffer/decrypt_buffer methods that work on ASCII bytes in a bytearray/memoryview, in place or into a caller-provided buffer; run_chain_buffers chains them with two reusable buffers. BufferKernelCheck.py checks them against the str versions.
+- RecordChain reuses a saved session to seal one-line records independently (used by Bookstore.py for encrypted storage).
 
 Security: This is an educational tool only. Do NOT use for real secrets.
 
-Dependencies: pycryptodome (pip install pycryptodome)
+Dependencies: pycryptodome (pip install pycryptodome). Without it only the classical ciphers and the 'python' DES backend are available.
 
 Run: python hybrid_dynamic.py
 """
 import json
 import os
+import sys
 import math
 import base64
-from Crypto.Cipher import AES, DES
-from Crypto.Util.Padding import pad, unpad
+from array import array
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from Crypto.Cipher import AES, DES
+    from Crypto.Util.Padding import pad, unpad
+except ImportError:
+    AES = DES = None
+
+    def pad(data: bytes, block_size: int) -> bytes:
+        n = block_size - len(data) % block_size
+        return data + bytes([n]) * n
+
+    def unpad(data: bytes, block_size: int) -> bytes:
+        n = data[-1] if data else 0
+        if not 1 <= n <= block_size or len(data) % block_size or data[-n:] != bytes([n]) * n:
+            raise ValueError('Padding is incorrect.')
+        return data[:-n]
 
 SESSION_FILE = 'session.json'
 
+DES_BACKENDS = ('pycryptodome', 'python')
+DES_BACKEND = 'pycryptodome' if DES is not None else 'python'
+
 # ----------------------------- Helpers -----------------------------
 
 def to_b64(b: bytes) -> str:
@@ -52,6 +76,38 @@ def load_session() -> dict:
     with open(SESSION_FILE, 'r') as f:
         return json.load(f)
 
+# ----------------------------- Byte Buffer Helpers -----------------------------
+# The *_buffer methods below take ASCII data in a bytearray/memoryview (src) and
+# either transform it in place (dst=None) or write into dst, which must be large
+# enough. They return the number of bytes written; non-letters are left as-is.
+# Work is done in BUFFER_CHUNK-sized pieces, so scratch memory stays O(chunk).
+
+BUFFER_CHUNK = 1 << 16
+
+UPPER_TABLE = bytes.maketrans(b'abcdefghijklmnopqrstuvwxyz', b'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+LETTERS = bytes(c for c in range(256) if 65 <= c <= 90 or 97 <= c <= 122)
+NON_LETTERS = bytes(c for c in range(256) if not (65 <= c <= 90 or 97 <= c <= 122))
+
+
+def _letter_table(fn) -> bytes:
+    # 256-byte translate table applying fn (0..25 -> 0..25) to both letter cases.
+    table = bytearray(range(256))
+    for x in range(26):
+        table[65 + x] = 65 + fn(x)
+        table[97 + x] = 97 + fn(x)
+    return bytes(table)
+
+
+def _translate_buffer(src, dst, table: bytes) -> int:
+    if dst is None:
+        dst = src
+    n = len(src)
+    with memoryview(src) as mv:
+        for i in range(0, n, BUFFER_CHUNK):
+            j = min(i + BUFFER_CHUNK, n)
+            dst[i:j] = bytes(mv[i:j]).translate(table)
+    return n
+
 # ----------------------------- Classical Ciphers -----------------------------
 
 class Caesar:
@@ -68,6 +124,18 @@ class Caesar:
     def decrypt(text: str, shift: int) -> str:
         return Caesar.encrypt(text, -shift)
 
+    @staticmethod
+    def _table(shift: int) -> bytes:
+        return _letter_table(lambda x: (x + shift) % 26)
+
+    @staticmethod
+    def encrypt_buffer(src, shift: int, dst=None) -> int:
+        return _translate_buffer(src, dst, Caesar._table(shift))
+
+    @staticmethod
+    def decrypt_buffer(src, shift: int, dst=None) -> int:
+        return _translate_buffer(src, dst, Caesar._table(-shift))
+
 class Affine:
     @staticmethod
     def egcd(a,b):
@@ -107,6 +175,23 @@ class Affine:
                 out.append(ch)
         return ''.join(out)
 
+    @staticmethod
+    def _table(a: int, b: int, decrypt: bool = False) -> bytes:
+        if decrypt:
+            a_inv = Affine.modinv(a,26)
+            return _letter_table(lambda x: (a_inv*(x-b)) % 26)
+        if math.gcd(a,26) != 1:
+            raise ValueError('a must be coprime with 26')
+        return _letter_table(lambda x: (a*x+b) % 26)
+
+    @staticmethod
+    def encrypt_buffer(src, a: int, b: int, dst=None) -> int:
+        return _translate_buffer(src, dst, Affine._table(a, b))
+
+    @staticmethod
+    def decrypt_buffer(src, a: int, b: int, dst=None) -> int:
+        return _translate_buffer(src, dst, Affine._table(a, b, decrypt=True))
+
 class Hill2x2:
     @staticmethod
     def _nums(s: str):
@@ -158,6 +243,77 @@ class Hill2x2:
             out.extend([x1, x2])
         return Hill2x2._text(out)
 
+    _digram_tables = {}
+
+    @staticmethod
+    def _digram_table(matrix) -> list:
+        # 65536 entries: native-endian uint16 of an uppercase digram -> its image.
+        key = tuple(map(tuple, matrix))
+        table = Hill2x2._digram_tables.get(key)
+        if table is None:
+            table = [0] * 65536
+            for x1 in range(26):
+                for x2 in range(26):
+                    y1 = (matrix[0][0]*x1 + matrix[0][1]*x2) % 26
+                    y2 = (matrix[1][0]*x1 + matrix[1][1]*x2) % 26
+                    src = int.from_bytes(bytes((65+x1, 65+x2)), sys.byteorder)
+                    table[src] = int.from_bytes(bytes((65+y1, 65+y2)), sys.byteorder)
+            Hill2x2._digram_tables[key] = table
+        return table
+
+    @staticmethod
+    def _map_digrams(letters, table, dst) -> int:
+        # letters: an even number of uppercase letters; may be the same buffer as dst.
+        n = len(letters)
+        step = max(2, BUFFER_CHUNK & ~1)  # whole digrams per chunk
+        with memoryview(letters) as mv:
+            for i in range(0, n, step):
+                j = min(i + step, n)
+                out = array('H', map(table.__getitem__, mv[i:j].cast('H')))
+                dst[i:j] = memoryview(out).cast('B')
+        return n
+
+    @staticmethod
+    def _stream(src, dst, table, pad: bool) -> int:
+        # Compact letters chunk by chunk and map whole digrams straight into dst.
+        # The write position never passes the read position, so dst may be src.
+        w = 0
+        carry = b''
+        with memoryview(src) as mv:
+            for i in range(0, len(src), BUFFER_CHUNK):
+                letters = carry + bytes(mv[i:i + BUFFER_CHUNK]).translate(UPPER_TABLE, NON_LETTERS)
+                even = len(letters) & ~1
+                carry = letters[even:]
+                w += Hill2x2._map_digrams(letters[:even], table, memoryview(dst)[w:w + even])
+        if carry:
+            if not pad:
+                raise ValueError('Hill2x2 ciphertext must have an even number of letters')
+            # the padded digram can be one byte past the letters in src
+            out = array('H', [table[int.from_bytes(carry + b'X', sys.byteorder)]])
+            dst[w:w + 2] = memoryview(out).cast('B')
+            w += 2
+        return w
+
+    # Hill drops non-letters, so the output can be one byte longer than the
+    # letters in src (padding 'X'); in place, src must then be a bytearray or
+    # have a spare byte.
+    @staticmethod
+    def encrypt_buffer(src, matrix, dst=None) -> int:
+        return Hill2x2._stream(src, src if dst is None else dst, Hill2x2._digram_table(matrix), True)
+
+    @staticmethod
+    def decrypt_buffer(src, matrix, dst=None) -> int:
+        # Count first so an odd ciphertext is rejected before anything is written.
+        letters = 0
+        with memoryview(src) as mv:
+            for i in range(0, len(src), BUFFER_CHUNK):
+                chunk = bytes(mv[i:i + BUFFER_CHUNK])
+                letters += len(chunk) - len(chunk.translate(None, LETTERS))
+        if letters % 2 == 1:
+            raise ValueError('Hill2x2 ciphertext must have an even number of letters')
+        table = Hill2x2._digram_table(Hill2x2._inv2(matrix))
+        return Hill2x2._stream(src, src if dst is None else dst, table, False)
+
 class RailFence:
     @staticmethod
     def encrypt(text: str, rails: int) -> str:
@@ -193,43 +349,275 @@ class RailFence:
             ptrs[r] += 1
         return ''.join(out)
 
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _counts(n: int, rails: int):
+        # Characters on each rail for a message of length n; cached, since every
+        # chunk (or parallel segment) of the same message needs them.
+        cycle = 2*rails - 2
+        per_pos = [max(0, (n - q + cycle - 1) // cycle) for q in range(cycle)]
+        return tuple([per_pos[0]] + [per_pos[r] + per_pos[cycle-r] for r in range(1, rails-1)] + [per_pos[rails-1]])
+
+    @staticmethod
+    def _gather_encrypt(src, dst, n: int, rails: int, j0: int, j1: int):
+        # Fill dst[j0:j1] of the ciphertext: rails are laid out one after another,
+        # and rail r holds positions r, cycle-r, r+cycle, 2*cycle-r, ... of src.
+        cycle = 2*rails - 2
+        rail_start = 0
+        for r, count in enumerate(RailFence._counts(n, rails)):
+            k0, k1 = max(j0 - rail_start, 0), min(j1 - rail_start, count)
+            if k0 < k1:
+                if r == 0 or r == rails-1:
+                    part = bytes(src[r + k0*cycle: r + k1*cycle: cycle])
+                else:
+                    part = bytearray(k1 - k0)
+                    ia0, ia1 = (k0 + 1) // 2, (k1 + 1) // 2
+                    ib0, ib1 = k0 // 2, k1 // 2
+                    if ia0 < ia1:
+                        part[2*ia0 - k0::2] = src[r + ia0*cycle: r + ia1*cycle: cycle]
+                    if ib0 < ib1:
+                        part[2*ib0 + 1 - k0::2] = src[cycle - r + ib0*cycle: cycle - r + ib1*cycle: cycle]
+                dst[rail_start + k0: rail_start + k1] = part
+            rail_start += count
+
+    @staticmethod
+    def _gather_decrypt(src, dst, n: int, rails: int, p0: int, p1: int):
+        # Fill dst[p0:p1] of the plaintext by reading each rail's run of src.
+        cycle = 2*rails - 2
+        part = bytearray(p1 - p0)
+        rail_start = 0
+        for r, count in enumerate(RailFence._counts(n, rails)):
+            edge = r == 0 or r == rails-1
+            step = 1 if edge else 2
+            firsts = [(r, 0)] if edge else [(r, 0), (cycle - r, 1)]
+            for first, rank in firsts:
+                i0 = max(0, -(-(p0 - first) // cycle))
+                i1 = max(0, -(-(p1 - first) // cycle))
+                if i0 < i1:
+                    c0 = rail_start + step*i0 + rank
+                    part[first + i0*cycle - p0::cycle] = src[c0: c0 + step*(i1 - i0): step]
+            rail_start += count
+        dst[p0:p1] = part
+
+    @staticmethod
+    def _permute_buffer(src, rails: int, dst, gather) -> int:
+        n = len(src)
+        if dst is None and rails <= 1:
+            return n
+        if dst is None:
+            # Every output byte can depend on any input byte, so in place needs
+            # one snapshot of src; pass dst (as run_chain_buffers does) to avoid it.
+            src, dst = bytes(src), src
+        with memoryview(src) as mv:
+            for i in range(0, n, BUFFER_CHUNK):
+                j = min(i + BUFFER_CHUNK, n)
+                if rails <= 1:
+                    dst[i:j] = mv[i:j]
+                else:
+                    gather(mv, dst, n, rails, i, j)
+        return n
+
+    @staticmethod
+    def encrypt_buffer(src, rails: int, dst=None) -> int:
+        return RailFence._permute_buffer(src, rails, dst, RailFence._gather_encrypt)
+
+    @staticmethod
+    def decrypt_buffer(src, rails: int, dst=None) -> int:
+        return RailFence._permute_buffer(src, rails, dst, RailFence._gather_decrypt)
+
 # ----------------------------- Modern Ciphers (DES/AES in CBC) -----------------------------
 
+def require_pycryptodome(name: str):
+    if AES is None:
+        raise RuntimeError(f'{name} needs pycryptodome (pip install pycryptodome)')
+
 class AESCBC:
     @staticmethod
     def encrypt(text: str, key: bytes) -> str:
+        return AESCBC.encrypt_bytes(text.encode('utf-8'), key).decode('ascii')
+
+    @staticmethod
+    def decrypt(b64blob: str, key: bytes) -> str:
+        return AESCBC.decrypt_bytes(b64blob.encode('ascii'), key).decode('utf-8')
+
+    # bytes in, base64 (iv+ct) bytes out, so buffers can skip the str round trip
+    @staticmethod
+    def encrypt_bytes(data: bytes, key: bytes) -> bytes:
+        require_pycryptodome('AES')
         if len(key) not in (16,24,32):
             raise ValueError('AES key must be 16/24/32 bytes long')
         iv = os.urandom(16)
         cipher = AES.new(key, AES.MODE_CBC, iv)
-        ct = cipher.encrypt(pad(text.encode('utf-8'), AES.block_size))
-        return to_b64(iv + ct)
+        ct = cipher.encrypt(pad(data, AES.block_size))
+        return base64.b64encode(iv + ct)
 
     @staticmethod
-    def decrypt(b64blob: str, key: bytes) -> str:
-        blob = from_b64(b64blob)
+    def decrypt_bytes(b64blob: bytes, key: bytes) -> bytes:
+        require_pycryptodome('AES')
+        blob = base64.b64decode(b64blob)
         iv, ct = blob[:16], blob[16:]
         cipher = AES.new(key, AES.MODE_CBC, iv)
-        pt = unpad(cipher.decrypt(ct), AES.block_size)
-        return pt.decode('utf-8')
+        return unpad(cipher.decrypt(ct), AES.block_size)
 
 class DESCBC:
+    # backend 'pycryptodome' or 'python' (PureDES.DESEngine); output is identical.
     @staticmethod
-    def encrypt(text: str, key: bytes) -> str:
+    def encrypt(text: str, key: bytes, backend: str = None) -> str:
+        return DESCBC.encrypt_bytes(text.encode('utf-8'), key, backend).decode('ascii')
+
+    @staticmethod
+    def decrypt(b64blob: str, key: bytes, backend: str = None) -> str:
+        return DESCBC.decrypt_bytes(b64blob.encode('ascii'), key, backend).decode('utf-8')
+
+    @staticmethod
+    def encrypt_bytes(data: bytes, key: bytes, backend: str = None) -> bytes:
         if len(key) != 8:
             raise ValueError('DES key must be 8 bytes long')
+        backend = DESCBC._backend(backend)
         iv = os.urandom(8)
-        cipher = DES.new(key, DES.MODE_CBC, iv)
-        ct = cipher.encrypt(pad(text.encode('utf-8'), DES.block_size))
-        return to_b64(iv + ct)
+        data = pad(data, 8)
+        if backend == 'python':
+            from PureDES import DESEngine  # imported on use: loads NumPy and builds tables
+            ct = DESEngine(key).encrypt_cbc(data, iv)
+        else:
+            ct = DES.new(key, DES.MODE_CBC, iv).encrypt(data)
+        return base64.b64encode(iv + ct)
 
     @staticmethod
-    def decrypt(b64blob: str, key: bytes) -> str:
-        blob = from_b64(b64blob)
+    def decrypt_bytes(b64blob: bytes, key: bytes, backend: str = None) -> bytes:
+        backend = DESCBC._backend(backend)
+        blob = base64.b64decode(b64blob)
         iv, ct = blob[:8], blob[8:]
-        cipher = DES.new(key, DES.MODE_CBC, iv)
-        pt = unpad(cipher.decrypt(ct), DES.block_size)
-        return pt.decode('utf-8')
+        if backend == 'python':
+            from PureDES import DESEngine
+            pt = DESEngine(key).decrypt_cbc(ct, iv)
+        else:
+            pt = DES.new(key, DES.MODE_CBC, iv).decrypt(ct)
+        return unpad(pt, 8)
+
+    @staticmethod
+    def _backend(backend):
+        backend = backend or DES_BACKEND
+        if backend not in DES_BACKENDS:
+            raise ValueError(f'unknown DES backend: {backend}')
+        # Both backends produce the same bytes, so a session recorded with
+        # pycryptodome can still be replayed where it is not installed.
+        if backend == 'pycryptodome' and DES is None:
+            return 'python'
+        return backend
+
+# ----------------------------- Per-record Sealing -----------------------------
+
+class RecordChain:
+    """Seal single-line records independently with a session's algorithm chain.
+
+    Each record goes through the session steps exactly as apply_encrypt would,
+    except AES steps, which use CTR mode with a fresh 8-byte nonce per record.
+    The AES and DES key schedules are built once per step (an ECB cipher
+    object for the AES keystream and for DES-CBC, or a DESEngine for the
+    'python' backend), so sealing a record costs time proportional to the
+    record, not to the file it is appended to.
+    """
+
+    def __init__(self, steps):
+        if not any(step['algo'] == 'AES' for step in steps):
+            raise ValueError('record chain needs at least one AES step')
+        if any(step['algo'] == 'Hill2x2' for step in steps):
+            raise ValueError('Hill2x2 drops non-letters and cannot seal records')
+        require_pycryptodome('RecordChain')
+        self.steps = steps
+        self._aes = {}
+        self._des = {}   # step -> (encrypt_cbc, decrypt_cbc), both taking (data, iv)
+        for i, step in enumerate(steps):
+            if step['algo'] == 'AES':
+                key = from_b64(step['params']['key_b64'])
+                if len(key) not in (16,24,32):
+                    raise ValueError('AES key must be 16/24/32 bytes long')
+                self._aes[i] = AES.new(key, AES.MODE_ECB)
+            elif step['algo'] == 'DES':
+                key = from_b64(step['params']['key_b64'])
+                if len(key) != 8:
+                    raise ValueError('DES key must be 8 bytes long')
+                if DESCBC._backend(step['params'].get('backend')) == 'python':
+                    from PureDES import DESEngine
+                    engine = DESEngine(key)
+                    self._des[i] = (engine.encrypt_cbc, engine.decrypt_cbc)
+                else:
+                    ecb = DES.new(key, DES.MODE_ECB)
+                    self._des[i] = (lambda data, iv, ecb=ecb: RecordChain._cbc_encrypt(ecb, data, iv),
+                                    lambda data, iv, ecb=ecb: RecordChain._cbc_decrypt(ecb, data, iv))
+
+    @staticmethod
+    def _ctr(ecb, nonce: bytes, data: bytes) -> bytes:
+        n = len(data)
+        counters = b''.join(nonce + i.to_bytes(8, 'big') for i in range((n + 15) // 16))
+        stream = ecb.encrypt(counters)[:n]
+        return (int.from_bytes(data, 'big') ^ int.from_bytes(stream, 'big')).to_bytes(n, 'big')
+
+    # DES-CBC on a cached ECB object; same iv+ct output as DESCBC.
+    @staticmethod
+    def _cbc_encrypt(ecb, data: bytes, iv: bytes) -> bytes:
+        out = []
+        prev = int.from_bytes(iv, 'big')
+        for k in range(0, len(data), 8):
+            block = ecb.encrypt((int.from_bytes(data[k:k+8], 'big') ^ prev).to_bytes(8, 'big'))
+            prev = int.from_bytes(block, 'big')
+            out.append(block)
+        return b''.join(out)
+
+    @staticmethod
+    def _cbc_decrypt(ecb, ct: bytes, iv: bytes) -> bytes:
+        n = len(ct)
+        prevs = iv + ct[:-8]
+        return (int.from_bytes(ecb.decrypt(ct), 'big') ^ int.from_bytes(prevs, 'big')).to_bytes(n, 'big')
+
+    def seal(self, record: str) -> str:
+        current = record
+        for i, step in enumerate(self.steps):
+            if i in self._aes:
+                nonce = os.urandom(8)
+                current = to_b64(nonce + RecordChain._ctr(self._aes[i], nonce, current.encode('utf-8')))
+            elif i in self._des:
+                iv = os.urandom(8)
+                current = to_b64(iv + self._des[i][0](pad(current.encode('utf-8'), 8), iv))
+            else:
+                current = apply_encrypt(step['algo'], step['params'], current)
+        return current
+
+    def open(self, sealed: str) -> str:
+        current = sealed
+        for i in reversed(range(len(self.steps))):
+            step = self.steps[i]
+            if i in self._aes:
+                blob = from_b64(current)
+                current = RecordChain._ctr(self._aes[i], blob[:8], blob[8:]).decode('utf-8')
+            elif i in self._des:
+                blob = from_b64(current)
+                current = unpad(self._des[i][1](blob[8:], blob[:8]), 8).decode('utf-8')
+            else:
+                current = apply_decrypt(step['algo'], step['params'], current)
+        return current
+
+    def open_many(self, sealed, batch_size=2048, workers=None):
+        """Open a list of sealed records, in parallel batches when it is large."""
+        if len(sealed) <= batch_size:
+            return [self.open(s) for s in sealed]
+        batches = [sealed[i:i+batch_size] for i in range(0, len(sealed), batch_size)]
+        out = []
+        with ProcessPoolExecutor(workers, initializer=_init_record_worker,
+                                 initargs=(self.steps,)) as pool:
+            for opened in pool.map(_open_record_batch, batches):
+                out.extend(opened)
+        return out
+
+_worker_chain = None
+
+def _init_record_worker(steps):
+    global _worker_chain
+    _worker_chain = RecordChain(steps)
+
+def _open_record_batch(batch):
+    return [_worker_chain.open(s) for s in batch]
 
 # ----------------------------- Menu and Flow -----------------------------
 
@@ -284,6 +672,13 @@ def ask_params_for_algo(algo: str) -> dict:
                 continue
             params['key_b64'] = to_b64(key)
             break
+        while True:
+            backend = input(f"DES backend ({'/'.join(DES_BACKENDS)}) [{DES_BACKEND}]: ").strip() or DES_BACKEND
+            if backend not in DES_BACKENDS:
+                print('Unknown DES backend.')
+                continue
+            params['backend'] = backend
+            break
     elif algo == 'AES':
         while True:
             key = input('Enter AES key (16/24/32 chars): ').encode('utf-8')
@@ -307,7 +702,7 @@ def apply_encrypt(algo: str, params: dict, text: str) -> str:
         return RailFence.encrypt(text, params['rails'])
     if algo == 'DES':
         key = from_b64(params['key_b64'])
-        return DESCBC.encrypt(text, key)
+        return DESCBC.encrypt(text, key, params.get('backend'))
     if algo == 'AES':
         key = from_b64(params['key_b64'])
         return AESCBC.encrypt(text, key)
@@ -325,12 +720,72 @@ def apply_decrypt(algo: str, params: dict, text: str) -> str:
         return RailFence.decrypt(text, params['rails'])
     if algo == 'DES':
         key = from_b64(params['key_b64'])
-        return DESCBC.decrypt(text, key)
+        return DESCBC.decrypt(text, key, params.get('backend'))
     if algo == 'AES':
         key = from_b64(params['key_b64'])
         return AESCBC.decrypt(text, key)
     raise ValueError('Unknown algorithm')
 
+def apply_buffer(algo: str, params: dict, src, dst, decrypt: bool = False) -> int:
+    # Buffer counterpart of apply_encrypt/apply_decrypt. Caesar/Affine work in
+    # place in src; the other steps write into dst. Returns the output length.
+    if algo == 'Caesar':
+        fn = Caesar.decrypt_buffer if decrypt else Caesar.encrypt_buffer
+        return fn(src, params['shift'])
+    if algo == 'Affine':
+        fn = Affine.decrypt_buffer if decrypt else Affine.encrypt_buffer
+        return fn(src, params['a'], params['b'])
+    if algo == 'Hill2x2':
+        fn = Hill2x2.decrypt_buffer if decrypt else Hill2x2.encrypt_buffer
+        return fn(src, params['matrix'], dst)
+    if algo == 'RailFence':
+        fn = RailFence.decrypt_buffer if decrypt else RailFence.encrypt_buffer
+        return fn(src, params['rails'], dst)
+    if algo in ('DES', 'AES'):
+        key = from_b64(params['key_b64'])
+        if algo == 'DES':
+            fn = DESCBC.decrypt_bytes if decrypt else DESCBC.encrypt_bytes
+            out = fn(bytes(src), key, params.get('backend'))
+        else:
+            fn = AESCBC.decrypt_bytes if decrypt else AESCBC.encrypt_bytes
+            out = fn(bytes(src), key)
+        dst[:len(out)] = out
+        return len(out)
+    raise ValueError('Unknown algorithm')
+
+
+def run_chain_buffers(steps, data: bytes, decrypt: bool = False) -> bytes:
+    """Run a session's steps (reversed when decrypting) over ASCII data.
+
+    Classical stages run in two ping-pong buffers reused for the whole chain,
+    with only chunk-sized scratch; DES/AES steps still allocate their input
+    copy and ciphertext.
+    """
+    ordered = list(reversed(steps)) if decrypt else list(steps)
+    cur, n = 0, len(data)
+    # +1: Hill2x2 may add a padding 'X'
+    bufs = [bytearray(n + 1), bytearray(n + 1)]
+    with memoryview(bufs[0]) as mv:
+        mv[:n] = data
+    for step in ordered:
+        algo = step['algo']
+        if algo in ('DES', 'AES'):
+            # iv + padding + base64 grow the data; resize before taking views.
+            need = ((n + 16) // 16 * 16 + 16) * 4 // 3 + 4
+        else:
+            need = n + 1
+        for i in (0, 1):
+            if len(bufs[i]) < need:
+                bufs[i].extend(bytes(need - len(bufs[i])))
+        with memoryview(bufs[cur]) as src_mv, memoryview(bufs[1-cur]) as dst_mv:
+            n = apply_buffer(algo, step['params'], src_mv[:n], dst_mv, decrypt)
+        if algo not in ('Caesar', 'Affine'):
+            cur = 1 - cur
+    out = bufs[cur]
+    bufs.clear()
+    with memoryview(out) as mv:
+        return bytes(mv[:n])
+
 # ----------------------------- User Flows -----------------------------
 
 def encrypt_flow():
@@ -0,0 +1,280 @@
+"""
+Parallel execution of the classical stages of a HybridCryptProject session on one large message.
+
+Features:
+- The message is copied once into a pair of multiprocessing.shared_memory buffers; workers
+  attach to them by name, so large strings are never pickled between processes.
+- Caesar/Affine: every worker translates a disjoint segment in place (256-byte lookup table).
+- Hill2x2: workers count letters per segment, the coordinator turns the counts into output
+  offsets, workers compact/uppercase their segment into the other buffer, then transform
+  disjoint even-aligned digram segments in place.
+- RailFence: a fixed permutation, done as a partitioned gather: every worker fills its own
+  range of the output buffer by reading the matching strided slices of the input.
+- DES/AES steps run on the coordinator through apply_encrypt/apply_decrypt, as before.
+
+The coordinator only computes segment boundaries and offsets. Results are identical to
+apply_encrypt/apply_decrypt. Non-ASCII messages fall back to the serial path, since the
+byte kernels assume one byte per character.
+
+Scaling with the number of workers has not been measured on a multi-core machine; the
+benchmark below prints the timings for 1..N workers so it can be checked where it runs.
+
+Run: python ParallelChain.py [size_mb]  (checks against the serial chain and times 1..N workers)
+"""
+import os
+import sys
+import time
+import random
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+from HybridCryptProject import (Caesar, Affine, Hill2x2, RailFence, apply_encrypt, apply_decrypt,
+                                UPPER_TABLE, LETTERS, NON_LETTERS, BUFFER_CHUNK, _translate_buffer)
+
+CLASSICAL = ('Caesar', 'Affine', 'Hill2x2', 'RailFence')
+MIN_SEGMENT = 1 << 16      # bytes; smaller segments are not worth a task
+SEGMENTS_PER_WORKER = 4
+
+
+def substitution_table(algo: str, params: dict, decrypt: bool) -> bytes:
+    """256-byte translate table for a per-letter cipher; non-letters map to themselves."""
+    if algo == 'Caesar':
+        return Caesar._table(-params['shift'] if decrypt else params['shift'])
+    return Affine._table(params['a'], params['b'], decrypt)
+
+# ----------------------------- Worker Kernels -----------------------------
+
+_shm = []     # attached SharedMemory objects (kept alive for the worker's lifetime)
+_bufs = []    # memoryviews of the two ping-pong buffers
+
+
+def _attach(names):
+    for name in names:
+        shm = shared_memory.SharedMemory(name=name)
+        _shm.append(shm)
+        _bufs.append(shm.buf)
+
+
+def _translate(buf, start, stop, table):
+    _translate_buffer(_bufs[buf][start:stop], None, table)
+
+
+def _count_letters(buf, start, stop):
+    count = 0
+    for i in range(start, stop, BUFFER_CHUNK):
+        seg = bytes(_bufs[buf][i:min(i + BUFFER_CHUNK, stop)])
+        count += len(seg) - len(seg.translate(None, LETTERS))
+    return count
+
+
+def _compact_letters(src, dst, start, stop, offset):
+    for i in range(start, stop, BUFFER_CHUNK):
+        letters = bytes(_bufs[src][i:min(i + BUFFER_CHUNK, stop)]).translate(UPPER_TABLE, NON_LETTERS)
+        _bufs[dst][offset:offset + len(letters)] = letters
+        offset += len(letters)
+
+
+def _hill_digrams(buf, start, stop, matrix):
+    seg = _bufs[buf][start:stop]
+    Hill2x2._map_digrams(seg, Hill2x2._digram_table(matrix), seg)
+
+
+def _rail_encrypt(src, dst, n, rails, j0, j1):
+    RailFence._gather_encrypt(_bufs[src], _bufs[dst], n, rails, j0, j1)
+
+
+def _rail_decrypt(src, dst, n, rails, p0, p1):
+    RailFence._gather_decrypt(_bufs[src], _bufs[dst], n, rails, p0, p1)
+
+
+_KERNELS = {
+    'translate': _translate,
+    'count': _count_letters,
+    'compact': _compact_letters,
+    'digrams': _hill_digrams,
+    'rail_enc': _rail_encrypt,
+    'rail_dec': _rail_decrypt,
+}
+
+
+def _run_task(task):
+    return _KERNELS[task[0]](*task[1:])
+
+# ----------------------------- Coordinator -----------------------------
+
+def _segments(n: int, parts: int, align: int = 1, min_segment: int = MIN_SEGMENT):
+    size = max(min_segment, -(-n // parts))
+    size += -size % align
+    return [(i, min(i + size, n)) for i in range(0, n, size)]
+
+
+class ParallelRunner:
+    """Runs classical stages over two shared ping-pong buffers of a fixed capacity."""
+
+    def __init__(self, capacity: int, workers: int = None, min_segment: int = MIN_SEGMENT):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_segment = min_segment
+        # +1: Hill2x2 may add a padding 'X'
+        self.shm = [shared_memory.SharedMemory(create=True, size=capacity + 1) for _ in range(2)]
+        names = [s.name for s in self.shm]
+        if self.workers > 1:
+            self.pool = mp.Pool(self.workers, initializer=_attach, initargs=(names,))
+        else:
+            self.pool = None
+            _bufs[:] = [s.buf for s in self.shm]
+        self.cur = 0
+        self.n = 0
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+        else:
+            _bufs.clear()
+        for s in self.shm:
+            s.close()
+            s.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _map(self, tasks):
+        if self.pool is None:
+            return [_run_task(t) for t in tasks]
+        return self.pool.map(_run_task, tasks, chunksize=1)
+
+    def _parts(self, align: int = 1):
+        return _segments(self.n, self.workers * SEGMENTS_PER_WORKER, align, self.min_segment)
+
+    def load(self, data: bytes):
+        self.n = len(data)
+        self.shm[self.cur].buf[:self.n] = data
+
+    def result(self) -> bytes:
+        return bytes(self.shm[self.cur].buf[:self.n])
+
+    def substitute(self, table: bytes):
+        self._map([('translate', self.cur, a, b, table) for a, b in self._parts()])
+
+    def hill(self, matrix, decrypt: bool):
+        src, dst = self.cur, 1 - self.cur
+        parts = self._parts()
+        counts = self._map([('count', src, a, b) for a, b in parts])
+        offsets = [0]
+        for c in counts:
+            offsets.append(offsets[-1] + c)
+        self._map([('compact', src, dst, a, b, off) for (a, b), off in zip(parts, offsets)])
+        self.cur, self.n = dst, offsets[-1]
+        if self.n % 2:
+            if decrypt:
+                raise ValueError('Hill2x2 ciphertext must have an even number of letters')
+            self.shm[dst].buf[self.n] = 88  # 'X'
+            self.n += 1
+        if decrypt:
+            matrix = Hill2x2._inv2(matrix)
+        matrix = tuple(map(tuple, matrix))
+        self._map([('digrams', dst, a, b, matrix) for a, b in self._parts(align=2)])
+
+    def rail_fence(self, rails: int, decrypt: bool):
+        if rails <= 1:
+            return
+        src, dst = self.cur, 1 - self.cur
+        kind = 'rail_dec' if decrypt else 'rail_enc'
+        self._map([(kind, src, dst, self.n, rails, a, b) for a, b in self._parts()])
+        self.cur = dst
+
+    def apply(self, algo: str, params: dict, decrypt: bool = False):
+        if algo in ('Caesar', 'Affine'):
+            self.substitute(substitution_table(algo, params, decrypt))
+        elif algo == 'Hill2x2':
+            self.hill(params['matrix'], decrypt)
+        elif algo == 'RailFence':
+            self.rail_fence(params['rails'], decrypt)
+        else:
+            raise ValueError(f'{algo} is not a classical stage')
+
+
+def _run_chain(steps, text: str, decrypt: bool, workers, min_segment):
+    ordered = list(reversed(steps)) if decrypt else list(steps)
+    serial = apply_decrypt if decrypt else apply_encrypt
+    i = 0
+    while i < len(ordered):
+        j = i
+        while j < len(ordered) and ordered[j]['algo'] in CLASSICAL:
+            j += 1
+        if j == i or not text.isascii():
+            step = ordered[i]
+            text = serial(step['algo'], step['params'], text)
+            i += 1
+            continue
+        # Run of classical stages: one copy in, one copy out.
+        with ParallelRunner(len(text), workers, min_segment) as runner:
+            runner.load(text.encode('ascii'))
+            for step in ordered[i:j]:
+                runner.apply(step['algo'], step['params'], decrypt)
+            text = runner.result().decode('ascii')
+        i = j
+    return text
+
+
+def parallel_encrypt(steps, text: str, workers: int = None, min_segment: int = MIN_SEGMENT) -> str:
+    """Same result as applying apply_encrypt for each step, using worker processes."""
+    return _run_chain(steps, text, False, workers, min_segment)
+
+
+def parallel_decrypt(steps, text: str, workers: int = None, min_segment: int = MIN_SEGMENT) -> str:
+    """Same result as applying apply_decrypt for each step in reverse order."""
+    return _run_chain(steps, text, True, workers, min_segment)
+
+# ----------------------------- Check and Benchmark -----------------------------
+
+def _serial(steps, text, decrypt=False):
+    if decrypt:
+        for step in reversed(steps):
+            text = apply_decrypt(step['algo'], step['params'], text)
+    else:
+        for step in steps:
+            text = apply_encrypt(step['algo'], step['params'], text)
+    return text
+
+
+def main():
+    size = int(float(sys.argv[1]) * (1 << 20)) if len(sys.argv) > 1 else 1 << 20
+    steps = [
+        {'algo': 'Caesar', 'params': {'shift': 7}},
+        {'algo': 'RailFence', 'params': {'rails': 5}},
+        {'algo': 'Affine', 'params': {'a': 5, 'b': 8}},
+        {'algo': 'Hill2x2', 'params': {'matrix': [[3, 3], [2, 5]]}},
+        {'algo': 'RailFence', 'params': {'rails': 3}},
+    ]
+    rng = random.Random(0)
+    alphabet = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ .,!\n'
+
+    # Correctness on small messages, with tiny segments so every boundary case is hit.
+    for n in list(range(0, 40)) + [97, 1001]:
+        text = ''.join(rng.choice(alphabet) for _ in range(n))
+        for w in (1, 3):
+            enc = parallel_encrypt(steps, text, w, min_segment=1)
+            assert enc == _serial(steps, text), (n, w)
+            assert parallel_decrypt(steps, enc, w, min_segment=1) == _serial(steps, enc, True), (n, w)
+    print('Parallel chain matches serial chain: OK')
+
+    text = ''.join(rng.choice(alphabet) for _ in range(size))
+    print(f'Chain: {" -> ".join(s["algo"] for s in steps)} on {size / (1 << 20):.1f} MB')
+    start = time.perf_counter()
+    expected = _serial(steps, text)
+    print(f'  serial apply_encrypt     {time.perf_counter() - start:7.2f}s')
+    w = 1
+    while w <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        out = parallel_encrypt(steps, text, w)
+        print(f'  parallel, {w:2d} worker(s)   {time.perf_counter() - start:7.2f}s')
+        assert out == expected
+        w *= 2
+
+
+if __name__ == '__main__':
+    main()
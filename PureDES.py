@@ -0,0 +1,406 @@
+"""
+Pure-Python DES engine (reference implementation of the algorithm in DES.pages).
+
+Features:
+- Table-driven rounds: each S-box is merged with the P permutation into a
+  64-entry SP table, so the f-function is 8 lookups ORed together.
+- IP/FP are done with per-byte lookup tables, and the 16 round subkeys are
+  computed once per key and cached.
+- ECB, CBC and CTR modes on bytes (no padding: data must be a multiple of 8 bytes).
+- Optional NumPy bitsliced mode: 64 independent blocks are packed into every
+  machine word (one word row per DES bit), so large ECB/CTR batches and CBC
+  decryption run thousands of blocks per NumPy operation.
+
+Used as the 'python' DES backend in HybridCryptProject.py and works without
+pycryptodome. NumPy is only needed for the bitsliced mode.
+
+Run: python PureDES.py  (known-answer test, cross-check with pycryptodome, throughput)
+"""
+import os
+import sys
+import time
+import struct
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ----------------------------- DES Tables -----------------------------
+
+IP = [58,50,42,34,26,18,10,2, 60,52,44,36,28,20,12,4,
+      62,54,46,38,30,22,14,6, 64,56,48,40,32,24,16,8,
+      57,49,41,33,25,17,9,1,  59,51,43,35,27,19,11,3,
+      61,53,45,37,29,21,13,5, 63,55,47,39,31,23,15,7]
+
+FP = [IP.index(i) + 1 for i in range(1, 65)]
+
+E = [32,1,2,3,4,5,     4,5,6,7,8,9,     8,9,10,11,12,13,     12,13,14,15,16,17,
+     16,17,18,19,20,21, 20,21,22,23,24,25, 24,25,26,27,28,29, 28,29,30,31,32,1]
+
+P = [16,7,20,21,29,12,28,17, 1,15,23,26,5,18,31,10,
+     2,8,24,14,32,27,3,9,    19,13,30,6,22,11,4,25]
+
+PC1 = [57,49,41,33,25,17,9,1,  58,50,42,34,26,18,10,2,
+       59,51,43,35,27,19,11,3, 60,52,44,36,
+       63,55,47,39,31,23,15,7, 62,54,46,38,30,22,14,6,
+       61,53,45,37,29,21,13,5, 28,20,12,4]
+
+PC2 = [14,17,11,24,1,5,   3,28,15,6,21,10,   23,19,12,4,26,8,   16,7,27,20,13,2,
+       41,52,31,37,47,55, 30,40,51,45,33,48, 44,49,39,56,34,53, 46,42,50,36,29,32]
+
+SHIFTS = [1,1,2,2,2,2,2,2,1,2,2,2,2,2,2,1]
+
+SBOX = [
+    [[14,4,13,1,2,15,11,8,3,10,6,12,5,9,0,7],
+     [0,15,7,4,14,2,13,1,10,6,12,11,9,5,3,8],
+     [4,1,14,8,13,6,2,11,15,12,9,7,3,10,5,0],
+     [15,12,8,2,4,9,1,7,5,11,3,14,10,0,6,13]],
+    [[15,1,8,14,6,11,3,4,9,7,2,13,12,0,5,10],
+     [3,13,4,7,15,2,8,14,12,0,1,10,6,9,11,5],
+     [0,14,7,11,10,4,13,1,5,8,12,6,9,3,2,15],
+     [13,8,10,1,3,15,4,2,11,6,7,12,0,5,14,9]],
+    [[10,0,9,14,6,3,15,5,1,13,12,7,11,4,2,8],
+     [13,7,0,9,3,4,6,10,2,8,5,14,12,11,15,1],
+     [13,6,4,9,8,15,3,0,11,1,2,12,5,10,14,7],
+     [1,10,13,0,6,9,8,7,4,15,14,3,11,5,2,12]],
+    [[7,13,14,3,0,6,9,10,1,2,8,5,11,12,4,15],
+     [13,8,11,5,6,15,0,3,4,7,2,12,1,10,14,9],
+     [10,6,9,0,12,11,7,13,15,1,3,14,5,2,8,4],
+     [3,15,0,6,10,1,13,8,9,4,5,11,12,7,2,14]],
+    [[2,12,4,1,7,10,11,6,8,5,3,15,13,0,14,9],
+     [14,11,2,12,4,7,13,1,5,0,15,10,3,9,8,6],
+     [4,2,1,11,10,13,7,8,15,9,12,5,6,3,0,14],
+     [11,8,12,7,1,14,2,13,6,15,0,9,10,4,5,3]],
+    [[12,1,10,15,9,2,6,8,0,13,3,4,14,7,5,11],
+     [10,15,4,2,7,12,9,5,6,1,13,14,0,11,3,8],
+     [9,14,15,5,2,8,12,3,7,0,4,10,1,13,11,6],
+     [4,3,2,12,9,5,15,10,11,14,1,7,6,0,8,13]],
+    [[4,11,2,14,15,0,8,13,3,12,9,7,5,10,6,1],
+     [13,0,11,7,4,9,1,10,14,3,5,12,2,15,8,6],
+     [1,4,11,13,12,3,7,14,10,15,6,8,0,5,9,2],
+     [6,11,13,8,1,4,10,7,9,5,0,15,14,2,3,12]],
+    [[13,2,8,4,6,15,11,1,10,9,3,14,5,0,12,7],
+     [1,15,13,8,10,3,7,4,12,5,6,11,0,14,9,2],
+     [7,11,4,1,9,12,14,2,0,6,10,13,15,3,5,8],
+     [2,1,14,7,4,10,8,13,15,12,9,0,3,5,6,11]],
+]
+
+# ----------------------------- Precomputed Lookups -----------------------------
+
+def permute(value: int, table, in_bits: int) -> int:
+    # Bit positions are 1-based from the most significant bit, as in the standard.
+    out = 0
+    for pos in table:
+        out = (out << 1) | ((value >> (in_bits - pos)) & 1)
+    return out
+
+
+def _sbox_lookup(box: int, six: int) -> int:
+    row = ((six >> 4) & 2) | (six & 1)
+    col = (six >> 1) & 15
+    return SBOX[box][row][col]
+
+
+def _byte_tables(table):
+    # tables[j][b] = permutation of a 64-bit word whose only set bits are byte j = b
+    return [[permute(b << (56 - 8*j), table, 64) for b in range(256)] for j in range(8)]
+
+
+SP = [[permute(_sbox_lookup(box, six) << (28 - 4*box), P, 32) for six in range(64)]
+      for box in range(8)]
+SP1, SP2, SP3, SP4, SP5, SP6, SP7, SP8 = SP
+
+IP_TABLES = _byte_tables(IP)
+FP_TABLES = _byte_tables(FP)
+
+
+def _permute64(x: int, tables) -> int:
+    t0, t1, t2, t3, t4, t5, t6, t7 = tables
+    return (t0[x >> 56] | t1[(x >> 48) & 255] | t2[(x >> 40) & 255] | t3[(x >> 32) & 255] |
+            t4[(x >> 24) & 255] | t5[(x >> 16) & 255] | t6[(x >> 8) & 255] | t7[x & 255])
+
+
+@lru_cache(maxsize=64)
+def key_schedule(key: bytes):
+    """Return the 16 round subkeys for key, each split into eight 6-bit chunks."""
+    if len(key) != 8:
+        raise ValueError('DES key must be 8 bytes long')
+    cd = permute(int.from_bytes(key, 'big'), PC1, 64)
+    c, d = cd >> 28, cd & 0xFFFFFFF
+    subkeys = []
+    for s in SHIFTS:
+        c = ((c << s) | (c >> (28 - s))) & 0xFFFFFFF
+        d = ((d << s) | (d >> (28 - s))) & 0xFFFFFFF
+        k = permute((c << 28) | d, PC2, 56)
+        subkeys.append(tuple((k >> (42 - 6*i)) & 63 for i in range(8)))
+    return tuple(subkeys)
+
+
+def _crypt_block(x: int, subkeys) -> int:
+    x = _permute64(x, IP_TABLES)
+    l, r = x >> 32, x & 0xFFFFFFFF
+    for k0, k1, k2, k3, k4, k5, k6, k7 in subkeys:
+        # Expansion E on the fly: a right rotation lines up chunks 1-7,
+        # a left rotation gives chunk 8 (bits 28..32, 1).
+        rot = ((r >> 1) | (r << 31)) & 0xFFFFFFFF
+        f = (SP1[(rot >> 26) ^ k0] | SP2[((rot >> 22) & 63) ^ k1] |
+             SP3[((rot >> 18) & 63) ^ k2] | SP4[((rot >> 14) & 63) ^ k3] |
+             SP5[((rot >> 10) & 63) ^ k4] | SP6[((rot >> 6) & 63) ^ k5] |
+             SP7[((rot >> 2) & 63) ^ k6] | SP8[(((r << 1) | (r >> 31)) & 63) ^ k7])
+        l, r = r, l ^ f
+    return _permute64((r << 32) | l, FP_TABLES)
+
+# ----------------------------- Bitsliced Mode (NumPy) -----------------------------
+
+BITSLICE_CHUNK = 1 << 16   # blocks per bitsliced batch (a multiple of 64)
+BITSLICE_MIN = 256         # below this many blocks the scalar path is faster
+
+# S-box truth tables: SBOX_TT[box][o] is output bit o (MSB first) for all 64 inputs.
+SBOX_TT = [[tuple((_sbox_lookup(box, v) >> (3 - o)) & 1 for v in range(64)) for o in range(4)]
+           for box in range(8)]
+
+
+def _mux(x, lo, hi):
+    # x ? hi : lo on bit planes; Python ints 0/1 are all-zero/all-one constants.
+    if isinstance(lo, int) and isinstance(hi, int):
+        if lo == hi:
+            return lo
+        return x if hi else ~x
+    if isinstance(lo, int):
+        return (x & hi) if lo == 0 else (~x | hi)
+    if isinstance(hi, int):
+        return (lo & ~x) if hi == 0 else (lo | x)
+    return lo ^ (x & (lo ^ hi))
+
+
+def _eval_tt(tt, xs, memo):
+    # Shannon expansion of a truth table over the input planes xs (MSB first).
+    # memo shares identical sub-functions between the four outputs of a box.
+    r = memo.get(tt)
+    if r is not None:
+        return r
+    if not any(tt):
+        r = 0
+    elif all(tt):
+        r = 1
+    else:
+        half = len(tt) // 2
+        x = xs[6 - half.bit_length()]
+        r = _mux(x, _eval_tt(tt[:half], xs, memo), _eval_tt(tt[half:], xs, memo))
+    memo[tt] = r
+    return r
+
+
+@lru_cache(maxsize=64)
+def _bitslice_keymasks(key: bytes):
+    # (16, 48, 1) array: all-ones rows where the round subkey bit is set.
+    masks = np.zeros((16, 48, 1), dtype=np.uint64)
+    for rnd, chunks in enumerate(key_schedule(key)):
+        for i, chunk in enumerate(chunks):
+            for j in range(6):
+                if (chunk >> (5 - j)) & 1:
+                    masks[rnd, 6*i + j, 0] = np.uint64(0xFFFFFFFFFFFFFFFF)
+    return masks
+
+
+def _to_planes(blocks):
+    # (N,) uint64 blocks, N a multiple of 64 -> (64, N // 64) bit planes.
+    bits = np.empty((64, len(blocks)), dtype=np.uint8)
+    for b in range(64):
+        bits[b] = (blocks >> np.uint64(63 - b)) & np.uint64(1)
+    return np.packbits(bits, axis=1).view(np.uint64)
+
+
+def _from_planes(planes):
+    bits = np.unpackbits(planes.view(np.uint8), axis=1)
+    blocks = np.zeros(bits.shape[1], dtype=np.uint64)
+    for b in range(64):
+        blocks |= bits[b].astype(np.uint64) << np.uint64(63 - b)
+    return blocks
+
+
+def bitsliced_crypt(blocks, key: bytes, decrypt: bool = False):
+    """Encrypt (or decrypt) a uint64 array of independent blocks in ECB fashion."""
+    if np is None:
+        raise RuntimeError('bitsliced DES needs NumPy (pip install numpy)')
+    masks = _bitslice_keymasks(key)
+    if decrypt:
+        masks = masks[::-1]
+    ip_idx = np.array(IP) - 1
+    e_idx = np.array(E) - 1
+    p_idx = np.array(P) - 1
+    fp_idx = np.array(FP) - 1
+    ones = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+    n = len(blocks)
+    out = np.empty(n, dtype=np.uint64)
+    for start in range(0, n, BITSLICE_CHUNK):
+        chunk = blocks[start:start + BITSLICE_CHUNK]
+        m = len(chunk)
+        if m % 64:
+            chunk = np.concatenate([chunk, np.zeros(64 - m % 64, dtype=np.uint64)])
+        planes = _to_planes(chunk)[ip_idx]
+        l, r = planes[:32], planes[32:]
+        s = np.empty_like(l)
+        for rnd in range(16):
+            x = r[e_idx] ^ masks[rnd]
+            for box in range(8):
+                xs = x[6*box:6*box + 6]
+                memo = {}
+                for o in range(4):
+                    v = _eval_tt(SBOX_TT[box][o], xs, memo)
+                    s[4*box + o] = (ones if v else 0) if isinstance(v, int) else v
+            l, r = r, l ^ s[p_idx]
+        planes = np.concatenate([r, l])[fp_idx]
+        out[start:start + m] = _from_planes(planes)[:m]
+    return out
+
+# ----------------------------- Engine -----------------------------
+
+class DESEngine:
+    def __init__(self, key: bytes):
+        self.key = key
+        self.subkeys = key_schedule(key)
+        self.subkeys_dec = self.subkeys[::-1]
+
+    @staticmethod
+    def _unpack(data: bytes):
+        if len(data) % 8:
+            raise ValueError('data must be a multiple of 8 bytes')
+        return struct.unpack(f'>{len(data) // 8}Q', data)
+
+    @staticmethod
+    def _pack(blocks) -> bytes:
+        return struct.pack(f'>{len(blocks)}Q', *blocks)
+
+    def _use_bitslice(self, nblocks: int, bitsliced) -> bool:
+        if bitsliced is None:
+            return np is not None and nblocks >= BITSLICE_MIN
+        return bitsliced
+
+    def _bitsliced_bytes(self, data: bytes, decrypt: bool) -> bytes:
+        blocks = np.frombuffer(data, dtype='>u8').astype(np.uint64)
+        return bitsliced_crypt(blocks, self.key, decrypt).astype('>u8').tobytes()
+
+    def encrypt_block(self, x: int) -> int:
+        return _crypt_block(x, self.subkeys)
+
+    def decrypt_block(self, x: int) -> int:
+        return _crypt_block(x, self.subkeys_dec)
+
+    def encrypt_ecb(self, data: bytes, bitsliced=None) -> bytes:
+        blocks = self._unpack(data)
+        if self._use_bitslice(len(blocks), bitsliced):
+            return self._bitsliced_bytes(data, False)
+        ks = self.subkeys
+        return self._pack([_crypt_block(x, ks) for x in blocks])
+
+    def decrypt_ecb(self, data: bytes, bitsliced=None) -> bytes:
+        blocks = self._unpack(data)
+        if self._use_bitslice(len(blocks), bitsliced):
+            return self._bitsliced_bytes(data, True)
+        ks = self.subkeys_dec
+        return self._pack([_crypt_block(x, ks) for x in blocks])
+
+    def encrypt_cbc(self, data: bytes, iv: bytes) -> bytes:
+        # CBC encryption is inherently sequential, so it always uses the scalar path.
+        prev = int.from_bytes(iv, 'big')
+        ks = self.subkeys
+        out = []
+        for x in self._unpack(data):
+            prev = _crypt_block(x ^ prev, ks)
+            out.append(prev)
+        return self._pack(out)
+
+    def decrypt_cbc(self, data: bytes, iv: bytes, bitsliced=None) -> bytes:
+        blocks = self._unpack(data)
+        prevs = (int.from_bytes(iv, 'big'),) + blocks[:-1]
+        plain = self._unpack(self.decrypt_ecb(data, bitsliced))
+        return self._pack([p ^ c for p, c in zip(plain, prevs)])
+
+    def crypt_ctr(self, data: bytes, nonce: bytes, bitsliced=None) -> bytes:
+        """CTR mode (encrypt == decrypt): counter block = 4-byte nonce || 4-byte counter."""
+        if len(nonce) != 4:
+            raise ValueError('CTR nonce must be 4 bytes long')
+        nblocks = (len(data) + 7) // 8
+        base = int.from_bytes(nonce, 'big') << 32
+        if self._use_bitslice(nblocks, bitsliced):
+            counters = np.uint64(base) + np.arange(nblocks, dtype=np.uint64)
+            stream = bitsliced_crypt(counters, self.key).astype('>u8').tobytes()
+        else:
+            stream = self.encrypt_ecb(self._pack([base + i for i in range(nblocks)]), False)
+        n = len(data)
+        return (int.from_bytes(data, 'big') ^ int.from_bytes(stream[:n], 'big')).to_bytes(n, 'big')
+
+# ----------------------------- Validation and Benchmark -----------------------------
+
+def self_test():
+    """Check the engine against the FIPS 46 example and, if available, pycryptodome."""
+    key = bytes.fromhex('133457799BBCDFF1')
+    eng = DESEngine(key)
+    assert eng.encrypt_block(0x0123456789ABCDEF) == 0x85E813540F0AB405
+    assert eng.decrypt_block(0x85E813540F0AB405) == 0x0123456789ABCDEF
+    print('Known-answer test: OK')
+
+    data = os.urandom(8 * 1000)
+    if np is not None:
+        assert eng.encrypt_ecb(data, True) == eng.encrypt_ecb(data, False)
+        assert eng.decrypt_ecb(data, True) == eng.decrypt_ecb(data, False)
+        print('Bitsliced vs scalar ECB: OK')
+
+    try:
+        from Crypto.Cipher import DES
+    except ImportError:
+        print('pycryptodome not installed: skipped cross-check')
+        return
+    for _ in range(5):
+        key, iv = os.urandom(8), os.urandom(8)
+        eng = DESEngine(key)
+        assert eng.encrypt_ecb(data) == DES.new(key, DES.MODE_ECB).encrypt(data)
+        ct = DES.new(key, DES.MODE_CBC, iv).encrypt(data)
+        assert eng.encrypt_cbc(data, iv) == ct
+        assert eng.decrypt_cbc(ct, iv) == data
+        nonce = os.urandom(4)
+        ref = DES.new(key, DES.MODE_CTR, nonce=nonce).encrypt(data[:-3])
+        assert eng.crypt_ctr(data[:-3], nonce) == ref
+    print('Cross-check with pycryptodome (ECB/CBC/CTR): OK')
+
+    from HybridCryptProject import DESCBC
+    for n in (0, 1, 7, 8, 9, 100):
+        key, data = os.urandom(8), os.urandom(n)
+        ct = DESCBC.encrypt_bytes(data, key, 'python')
+        assert DESCBC.decrypt_bytes(ct, key, 'pycryptodome') == data
+        ct = DESCBC.encrypt_bytes(data, key, 'pycryptodome')
+        assert DESCBC.decrypt_bytes(ct, key, 'python') == data
+    print('DESCBC round trip between backends: OK')
+
+
+def _throughput(label, fn, nbytes):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f'  {label:<28} {nbytes / elapsed / 1e6:8.2f} MB/s')
+
+
+def benchmark(nbytes=1 << 20):
+    key, iv = os.urandom(8), os.urandom(8)
+    data = os.urandom(nbytes)
+    eng = DESEngine(key)
+    print(f'Throughput on {nbytes >> 10} KiB:')
+    _throughput('pure Python CBC encrypt', lambda: eng.encrypt_cbc(data, iv), nbytes)
+    _throughput('pure Python ECB (scalar)', lambda: eng.encrypt_ecb(data, False), nbytes)
+    if np is not None:
+        _throughput('NumPy bitsliced ECB', lambda: eng.encrypt_ecb(data, True), nbytes)
+        _throughput('NumPy bitsliced CBC decrypt', lambda: eng.decrypt_cbc(data, iv, True), nbytes)
+    try:
+        from Crypto.Cipher import DES
+    except ImportError:
+        return
+    _throughput('pycryptodome CBC encrypt', lambda: DES.new(key, DES.MODE_CBC, iv).encrypt(data), nbytes)
+
+
+if __name__ == '__main__':
+    self_test()
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 20)